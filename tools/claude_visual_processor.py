@@ -3,14 +3,14 @@
 Claude Visual Sheet Music Processor v1.0
 
 Direct visual processing workflow using Claude's image analysis:
-1. Convert PDF first page to JPEG image
+1. Convert PDF first page to JPEG image (PyMuPDF, or qlmanage + sips)
 2. Use Claude's Read tool to visually analyze the sheet music
 3. Extract metadata directly from visual inspection
 4. Organize original PDF based on extracted metadata
 5. Clean up temporary JPEG files
 
 Usage:
-    python3 claude_visual_processor.py [input_dir] [output_dir] [--single-file filename]
+    python3 claude_visual_processor.py [input_dir] [output_dir] [--single-file filename] [--workers N]
 """
 
 import os
@@ -21,11 +21,27 @@ import shutil
 import json
 import argparse
 import re
+import threading
+import concurrent.futures
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional, Tuple, Dict
 from dataclasses import dataclass
 
+# PyMuPDF renders first pages in-process when available; otherwise fall back
+# to the macOS qlmanage + sips tools
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+# Longest edge of the analysis JPEG, for both PyMuPDF and qlmanage -s
+JPEG_MAX_DIMENSION = 1200
+
+# Folder-name cleanup patterns, compiled once
+UNSAFE_FOLDER_CHARS = re.compile(r'[^\w\s-]')
+WHITESPACE_RUN = re.compile(r'\s+')
+
 @dataclass
 class SheetMusicMetadata:
     """Metadata extracted from sheet music"""
@@ -67,10 +83,11 @@ class ProcessingResult:
 class ClaudeVisualProcessor:
     """Sheet music processor using Claude's direct visual analysis"""
     
-    def __init__(self, input_path: str, output_path: str):
+    def __init__(self, input_path: str, output_path: str, max_workers: int = 4):
         self.input_path = Path(input_path).expanduser()
         self.output_path = Path(output_path).expanduser()
         self.temp_dir = Path(tempfile.mkdtemp(prefix="claude_visual_processor_"))
+        self.max_workers = max_workers
         
         # Create output directory
         self.output_path.mkdir(parents=True, exist_ok=True)
@@ -85,6 +102,10 @@ class ClaudeVisualProcessor:
             'failed': 0,
             'organized': 0
         }
+        self.stats_lock = threading.Lock()
+        
+        # PyMuPDF is not thread-safe, even across separate documents
+        self.render_lock = threading.Lock()
         
         # Check dependencies
         self.check_dependencies()
@@ -92,6 +113,7 @@ class ClaudeVisualProcessor:
     def setup_logging(self):
         """Setup logging configuration"""
         import logging
+        from logging.handlers import MemoryHandler
         
         log_dir = Path("reports")
         log_dir.mkdir(exist_ok=True)
@@ -117,11 +139,21 @@ class ClaudeVisualProcessor:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        self.logger.addHandler(file_handler)
+        # Buffer file writes instead of flushing on every record; errors
+        # still flush immediately and logging.shutdown() drains the rest
+        buffered_file_handler = MemoryHandler(
+            capacity=1024, flushLevel=logging.ERROR, target=file_handler
+        )
+        
+        self.logger.addHandler(buffered_file_handler)
         self.logger.addHandler(console_handler)
         
     def check_dependencies(self):
         """Check for required tools"""
+        if fitz is not None:
+            # PyMuPDF renders in-process; the macOS tools are only a fallback
+            return
+            
         # Check macOS tools
         required_tools = ['sips', 'qlmanage']
         missing = []
@@ -135,27 +167,45 @@ class ClaudeVisualProcessor:
                 
         if missing:
             self.logger.error(f"Missing required tools: {', '.join(missing)}")
-            raise RuntimeError("Install Xcode Command Line Tools: xcode-select --install")
+            raise RuntimeError("Install PyMuPDF (pip install PyMuPDF) or Xcode Command Line Tools: xcode-select --install")
             
     def find_pdf_files(self) -> List[Path]:
         """Find all PDF files for processing (including subdirectories)"""
+        # Single recursive walk; the case-insensitive suffix check also avoids
+        # listing a file twice on case-insensitive filesystems
         pdf_files = []
-        for pattern in ['*.pdf', '*.PDF']:
-            pdf_files.extend(self.input_path.rglob(pattern))  # Recursive search
+        for dirpath, _, filenames in os.walk(self.input_path):
+            for filename in filenames:
+                if filename.lower().endswith('.pdf'):
+                    pdf_files.append(Path(dirpath) / filename)
         
         self.logger.info(f"Found {len(pdf_files)} PDF files")
         return sorted(pdf_files)
         
     def convert_pdf_to_jpeg(self, pdf_path: Path) -> Optional[Path]:
         """Convert PDF first page to JPEG for Claude's visual analysis"""
+        work_dir = None
         try:
             # Create JPEG path
             jpeg_path = self.temp_dir / f"{pdf_path.stem}.jpg"
             
+            if fitz is not None:
+                try:
+                    self.render_first_page(pdf_path, jpeg_path)
+                    return jpeg_path
+                except Exception as e:
+                    # Files MuPDF cannot open, or an older PyMuPDF, still get
+                    # the macOS conversion below
+                    self.logger.warning(f"PyMuPDF render failed for {pdf_path.name}, using qlmanage: {e}")
+            
+            # qlmanage writes into its own folder so concurrent conversions
+            # never pick up each other's output
+            work_dir = Path(tempfile.mkdtemp(dir=self.temp_dir))
+            
             # Step 1: Convert PDF first page to image
             cmd = [
-                'qlmanage', '-t', '-s', '1200', 
-                '-o', str(self.temp_dir), str(pdf_path)
+                'qlmanage', '-t', '-s', str(JPEG_MAX_DIMENSION), 
+                '-o', str(work_dir), str(pdf_path)
             ]
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
@@ -163,7 +213,7 @@ class ClaudeVisualProcessor:
                 raise RuntimeError(f"qlmanage failed: {result.stderr}")
                 
             # Find created file
-            created_files = list(self.temp_dir.glob(f"{pdf_path.stem}*"))
+            created_files = list(work_dir.glob(f"{pdf_path.stem}*"))
             if not created_files:
                 raise RuntimeError("No image created by qlmanage")
                 
@@ -185,6 +235,19 @@ class ClaudeVisualProcessor:
         except Exception as e:
             self.logger.error(f"JPEG conversion failed for {pdf_path.name}: {e}")
             return None
+            
+        finally:
+            if work_dir is not None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def render_first_page(self, pdf_path: Path, jpeg_path: Path):
+        """Render the PDF's first page straight to JPEG with PyMuPDF"""
+        with self.render_lock:
+            with fitz.open(pdf_path) as doc:
+                page = doc[0]
+                zoom = JPEG_MAX_DIMENSION / max(page.rect.width, page.rect.height)
+                pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                pixmap.save(str(jpeg_path), jpg_quality=85)
     
     def analyze_sheet_music_image(self, image_path: Path) -> SheetMusicMetadata:
         """
@@ -207,8 +270,8 @@ class ClaudeVisualProcessor:
         piece_name = metadata.piece_name or "Unknown_Piece"
         
         # Clean piece name for folder
-        clean_piece = re.sub(r'[^\w\s-]', '', piece_name)
-        clean_piece = re.sub(r'\s+', '_', clean_piece.strip())
+        clean_piece = UNSAFE_FOLDER_CHARS.sub('', piece_name)
+        clean_piece = WHITESPACE_RUN.sub('_', clean_piece.strip())
         
         # Create organized path: Piece/Instrument/Part/
         path_parts = [clean_piece]
@@ -268,8 +331,9 @@ class ClaudeVisualProcessor:
             if final_path:
                 result.final_path = str(final_path)
                 result.success = True
-                self.stats['successful'] += 1
-                self.stats['organized'] += 1
+                with self.stats_lock:
+                    self.stats['successful'] += 1
+                    self.stats['organized'] += 1
             else:
                 result.error = "Failed to organize file"
                 
@@ -279,6 +343,10 @@ class ClaudeVisualProcessor:
                     
         return result
         
+    def process_group(self, group: List[Tuple[int, Path]]) -> List[Tuple[int, ProcessingResult]]:
+        """Process (index, file) pairs one after another, keeping their indexes"""
+        return [(index, self.process_file(pdf_file)) for index, pdf_file in group]
+        
     def process_single_file(self, filename: str) -> Optional[ProcessingResult]:
         """Process a single specific file"""
         pdf_files = self.find_pdf_files()
@@ -316,17 +384,32 @@ class ClaudeVisualProcessor:
         self.logger.info(f"Output: {self.output_path}")
         self.logger.info(f"Workflow: PDF → JPEG → Claude Visual Analysis → Organize Original")
         
-        for i, file_path in enumerate(pdf_files):
-            self.stats['processed'] += 1
-            result = self.process_file(file_path)
-            results.append(result)
-            
-            if not result.success:
-                self.stats['failed'] += 1
-                
-            # Progress update
-            if (i + 1) % batch_size == 0:
-                self.logger.info(f"Progress: {i + 1}/{len(pdf_files)} files processed")
+        # Files sharing a name share both their temp JPEG and (with the same
+        # metadata) their destination, so each such group runs serially in one
+        # worker; stems are compared lowercased for case-insensitive volumes
+        name_groups = {}
+        for index, pdf_file in enumerate(pdf_files):
+            name_groups.setdefault(pdf_file.stem.lower(), []).append((index, pdf_file))
+        
+        # The pool overlaps copies and qlmanage/sips subprocesses; PyMuPDF
+        # renders are serialized by render_lock, so with PyMuPDF installed
+        # extra workers mainly overlap one render with other files' copies
+        results = [None] * len(pdf_files)
+        done = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for group_results in executor.map(self.process_group, name_groups.values()):
+                for index, result in group_results:
+                    results[index] = result
+                    done += 1
+                    
+                    with self.stats_lock:
+                        self.stats['processed'] += 1
+                        if not result.success:
+                            self.stats['failed'] += 1
+                        
+                    # Progress update (batch_size only controls reporting)
+                    if done % batch_size == 0:
+                        self.logger.info(f"Progress: {done}/{len(pdf_files)} files processed")
                 
         return results
         
@@ -374,11 +457,12 @@ def main():
     parser.add_argument('output_path', help='Output directory for organized files')
     parser.add_argument('--single-file', help='Process only this specific filename')
     parser.add_argument('--batch-size', type=int, default=5, help='Batch size for processing')
+    parser.add_argument('--workers', type=int, default=4, help='Number of files processed concurrently')
     
     args = parser.parse_args()
     
     # Create processor
-    processor = ClaudeVisualProcessor(args.input_path, args.output_path)
+    processor = ClaudeVisualProcessor(args.input_path, args.output_path, args.workers)
     
     try:
         # Process files
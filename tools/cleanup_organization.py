@@ -13,10 +13,50 @@ import re
 import os
 from pathlib import Path
 
+# Folder-name cleanup patterns, compiled once
+UNSAFE_FOLDER_CHARS = re.compile(r'[^\w\s\-\.]')
+WHITESPACE_RUN = re.compile(r'\s+')
+
+# Filename keyword → metadata value, in priority order (first listed wins)
+INSTRUMENT_KEYWORDS = {
+    'trombone': 'Trombone',
+    'cornet': 'Cornet', 
+    'clarinet': 'Clarinet',
+    'flute': 'Flute',
+    'bassoon': 'Bassoon',
+    'euphonium': 'Euphonium',
+    'baritone': 'Baritone',
+    'timpani': 'Timpani',
+    'saxophone': 'Saxophone',
+    'oboe': 'Oboe'
+}
+
+PART_KEYWORDS = {
+    '1st': '1st',
+    'first': '1st', 
+    '2nd': '2nd',
+    'second': '2nd',
+    '3rd': '3rd', 
+    'third': '3rd',
+    'solo': 'Solo'
+}
+
+# Folder names recognised while walking an organized tree
+KNOWN_PIECE_FOLDERS = frozenset({'French_Comedy_Overture', 'Feodora_Ouverture'})
+INSTRUMENT_FOLDERS = frozenset({
+    'Trombone', 'Cornet', 'Clarinet', 'Flute', 'Bassoon', 'Euphonium',
+    'Timpani', 'Saxophone', 'Oboe'
+})
+NON_PIECE_FOLDERS = frozenset({
+    'System Volume Information', 'Archive_Pre_Organization', 'headers',
+    'SheetMusic', 'SheetMusic_backup_quick', 'SheetMusic_old_structure',
+    'STORE N GO', '9'
+})
+
 def clean_filename_for_folder(name):
     """Clean a name to be safe for folder names"""
-    clean = re.sub(r'[^\w\s\-\.]', '', str(name))
-    clean = re.sub(r'\s+', '_', clean.strip())
+    clean = UNSAFE_FOLDER_CHARS.sub('', str(name))
+    clean = WHITESPACE_RUN.sub('_', clean.strip())
     return clean
 
 def create_descriptive_filename(piece, instrument, part, original_name):
@@ -42,8 +82,11 @@ def create_descriptive_filename(piece, instrument, part, original_name):
         # Fall back to original name
         return original_name
 
-def analyze_filename_for_metadata(filename):
-    """Extract metadata from filename patterns"""
+def analyze_filename_for_metadata(filename, filename_lower=None):
+    """Extract metadata from filename patterns
+    
+    Callers that already lowercased the name can pass it as filename_lower.
+    """
     metadata = {
         'piece_name': 'Unknown',
         'instrument': 'Unknown', 
@@ -52,7 +95,8 @@ def analyze_filename_for_metadata(filename):
         'composer': 'Unknown'
     }
     
-    filename_lower = filename.lower()
+    if filename_lower is None:
+        filename_lower = filename.lower()
     
     # French Comedy Overture detection
     if 'french_comedy' in filename_lower or 'french comedy' in filename_lower:
@@ -65,36 +109,13 @@ def analyze_filename_for_metadata(filename):
         metadata['composer'] = 'P_Tschaikowsky'
     
     # Instrument detection
-    instruments = {
-        'trombone': 'Trombone',
-        'cornet': 'Cornet', 
-        'clarinet': 'Clarinet',
-        'flute': 'Flute',
-        'bassoon': 'Bassoon',
-        'euphonium': 'Euphonium',
-        'baritone': 'Baritone',
-        'timpani': 'Timpani',
-        'saxophone': 'Saxophone',
-        'oboe': 'Oboe'
-    }
-    
-    for pattern, instrument in instruments.items():
+    for pattern, instrument in INSTRUMENT_KEYWORDS.items():
         if pattern in filename_lower:
             metadata['instrument'] = instrument
             break
     
     # Part detection
-    parts = {
-        '1st': '1st',
-        'first': '1st', 
-        '2nd': '2nd',
-        'second': '2nd',
-        '3rd': '3rd', 
-        'third': '3rd',
-        'solo': 'Solo'
-    }
-    
-    for pattern, part in parts.items():
+    for pattern, part in PART_KEYWORDS.items():
         if pattern in filename_lower:
             metadata['part'] = part
             break
@@ -111,6 +132,13 @@ def analyze_filename_for_metadata(filename):
     
     return metadata
 
+def walk_pdf_paths(root):
+    """Yield the path of every .pdf under root using os.walk"""
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith('.pdf'):
+                yield os.path.join(dirpath, filename)
+
 def cleanup_usb_organization():
     """Main cleanup function"""
     usb_path = Path('/Volumes/STORE N GO')
@@ -209,30 +237,35 @@ def cleanup_usb_organization():
     # Final cleanup - improve file naming for remaining files
     print("\n📝 Improving file names...")
     
-    for pdf_file in usb_path.rglob('*.pdf'):
-        if pdf_file.name.startswith('._'):
+    for pdf_path in walk_pdf_paths(usb_path):
+        filename = os.path.basename(pdf_path)
+        if filename.startswith('._'):
             continue
         
+        # Lowercase once; reused by the skip check and the metadata scan
+        name_lower = filename.lower()
+        
         # Skip files we already renamed
-        if any(desc_word in pdf_file.name.lower() for desc_word in ['feodora', 'french_comedy']):
+        if 'feodora' in name_lower or 'french_comedy' in name_lower:
             continue
         
+        pdf_file = Path(pdf_path)
+        
         # Analyze filename for better metadata
-        metadata = analyze_filename_for_metadata(pdf_file.name)
+        metadata = analyze_filename_for_metadata(filename, name_lower)
         
         # Get current folder structure for context
         path_parts = pdf_file.parts
         
         # Extract piece and instrument from path
         for part in reversed(path_parts):
-            if part in ['French_Comedy_Overture', 'Feodora_Ouverture']:
+            if part in KNOWN_PIECE_FOLDERS:
                 metadata['piece_name'] = part
                 break
         
         # Find instrument folder in path
-        instruments = ['Trombone', 'Cornet', 'Clarinet', 'Flute', 'Bassoon', 'Euphonium', 'Timpani', 'Saxophone', 'Oboe']
         for part in path_parts:
-            if part in instruments:
+            if part in INSTRUMENT_FOLDERS:
                 metadata['instrument'] = part
                 break
         
@@ -256,11 +289,11 @@ def cleanup_usb_organization():
     # Show final structure
     print("\n📂 Final structure:")
     for piece_dir in sorted(usb_path.glob('*')):
-        if piece_dir.is_dir() and not piece_dir.name.startswith('.') and piece_dir.name not in ['System Volume Information', 'Archive_Pre_Organization', 'headers', 'SheetMusic', 'SheetMusic_backup_quick', 'SheetMusic_old_structure', 'STORE N GO', '9']:
+        if piece_dir.is_dir() and not piece_dir.name.startswith('.') and piece_dir.name not in NON_PIECE_FOLDERS:
             print(f"📁 {piece_dir.name}/")
             for instrument_dir in sorted(piece_dir.glob('*')):
                 if instrument_dir.is_dir():
-                    file_count = len(list(instrument_dir.rglob('*.pdf')))
+                    file_count = sum(1 for _ in walk_pdf_paths(instrument_dir))
                     print(f"   └── {instrument_dir.name}/ ({file_count} files)")
 
 if __name__ == "__main__":
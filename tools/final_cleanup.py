@@ -3,9 +3,48 @@
 Final cleanup - move all files out of Unknown folders and organize properly
 """
 
+import os
 import shutil
 from pathlib import Path
 
+# Folder names recognised while walking an organized tree
+KNOWN_PIECE_FOLDERS = frozenset({
+    'French_Comedy_Overture', 'Feodora_Ouverture', 'Military_Band_Music_Selections'
+})
+NON_PIECE_FOLDERS = frozenset({
+    'System Volume Information', 'Archive_Pre_Organization', 'headers',
+    'SheetMusic', 'SheetMusic_backup_quick', 'SheetMusic_old_structure',
+    'STORE N GO', '9'
+})
+
+def collect_piece_pdfs(piece_dir):
+    """Walk a piece folder once and group its PDFs by instrument and part
+    
+    Returns (total_files, {instrument: (instrument_files, {part: part_files})}).
+    Files nested below a part folder are counted with that part.
+    """
+    total_files = 0
+    instruments = {}
+    
+    for dirpath, _, filenames in os.walk(piece_dir):
+        pdf_files = [os.path.join(dirpath, name) for name in filenames if name.endswith('.pdf')]
+        if not pdf_files:
+            continue
+        total_files += len(pdf_files)
+        
+        relative = os.path.relpath(dirpath, piece_dir)
+        if relative == '.':
+            continue
+        
+        folders = relative.split(os.sep)
+        instrument_files, part_folders = instruments.setdefault(folders[0], ([], {}))
+        if len(folders) == 1:
+            instrument_files.extend(pdf_files)
+        else:
+            part_folders.setdefault(folders[1], []).extend(pdf_files)
+    
+    return total_files, instruments
+
 def final_cleanup():
     """Move all files out of Unknown folders to their parent instrument folders"""
     usb_path = Path('/Volumes/STORE N GO')
@@ -38,7 +77,7 @@ def final_cleanup():
                 # Extract piece name from path
                 piece_name = "Unknown"
                 for part in path_parts:
-                    if part in ['French_Comedy_Overture', 'Feodora_Ouverture', 'Military_Band_Music_Selections']:
+                    if part in KNOWN_PIECE_FOLDERS:
                         piece_name = part
                         break
                 
@@ -92,31 +131,26 @@ def final_cleanup():
     for piece_dir in sorted(usb_path.glob('*')):
         if (piece_dir.is_dir() and 
             not piece_dir.name.startswith('.') and 
-            piece_dir.name not in ['System Volume Information', 'Archive_Pre_Organization', 
-                                  'headers', 'SheetMusic', 'SheetMusic_backup_quick', 
-                                  'SheetMusic_old_structure', 'STORE N GO', '9']):
+            piece_dir.name not in NON_PIECE_FOLDERS):
             
-            total_files = len(list(piece_dir.rglob('*.pdf')))
+            total_files, instruments = collect_piece_pdfs(piece_dir)
             print(f"📁 {piece_dir.name}/ ({total_files} files total)")
             
-            for instrument_dir in sorted(piece_dir.glob('*')):
-                if instrument_dir.is_dir():
-                    pdf_files = list(instrument_dir.glob('*.pdf'))
-                    part_folders = [d for d in instrument_dir.glob('*') if d.is_dir()]
-                    
-                    if pdf_files:
-                        print(f"   ├── {instrument_dir.name}/ ({len(pdf_files)} files)")
-                        for pdf in sorted(pdf_files)[:3]:  # Show first 3 files
-                            print(f"   │   └── {pdf.name}")
-                        if len(pdf_files) > 3:
-                            print(f"   │   └── ... and {len(pdf_files) - 3} more")
-                    
-                    for part_dir in sorted(part_folders):
-                        part_files = list(part_dir.rglob('*.pdf'))
-                        if part_files:
-                            print(f"   ├── {instrument_dir.name}/{part_dir.name}/ ({len(part_files)} files)")
-                            for pdf in sorted(part_files):
-                                print(f"   │   └── {pdf.name}")
+            for instrument_name in sorted(instruments):
+                pdf_files, part_folders = instruments[instrument_name]
+                
+                if pdf_files:
+                    print(f"   ├── {instrument_name}/ ({len(pdf_files)} files)")
+                    for pdf in sorted(pdf_files)[:3]:  # Show first 3 files
+                        print(f"   │   └── {os.path.basename(pdf)}")
+                    if len(pdf_files) > 3:
+                        print(f"   │   └── ... and {len(pdf_files) - 3} more")
+                
+                for part_name in sorted(part_folders):
+                    part_files = part_folders[part_name]
+                    print(f"   ├── {instrument_name}/{part_name}/ ({len(part_files)} files)")
+                    for pdf in sorted(part_files):
+                        print(f"   │   └── {os.path.basename(pdf)}")
 
 if __name__ == "__main__":
     final_cleanup()
\ No newline at end of file
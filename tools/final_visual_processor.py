@@ -28,6 +28,10 @@ from datetime import datetime
 from typing import List, Optional, Tuple, Dict
 from dataclasses import dataclass
 
+# Folder-name cleanup patterns, compiled once
+UNSAFE_FOLDER_CHARS = re.compile(r'[^\w\s-]')
+WHITESPACE_RUN = re.compile(r'\s+')
+
 @dataclass
 class SheetMusicMetadata:
     """Metadata extracted from sheet music"""
@@ -169,14 +173,14 @@ def process_single_pdf(pdf_path: Path, output_dir: Path, interactive: bool = Fal
         part = metadata.part or "Unknown_Part"
         
         # Clean names for folders
-        clean_piece = re.sub(r'[^\w\s-]', '', piece_name)
-        clean_piece = re.sub(r'\s+', '_', clean_piece.strip())
+        clean_piece = UNSAFE_FOLDER_CHARS.sub('', piece_name)
+        clean_piece = WHITESPACE_RUN.sub('_', clean_piece.strip())
         
-        clean_instrument = re.sub(r'[^\w\s-]', '', instrument)
-        clean_instrument = re.sub(r'\s+', '_', clean_instrument.strip())
+        clean_instrument = UNSAFE_FOLDER_CHARS.sub('', instrument)
+        clean_instrument = WHITESPACE_RUN.sub('_', clean_instrument.strip())
         
-        clean_part = re.sub(r'[^\w\s-]', '', part)
-        clean_part = re.sub(r'\s+', '_', clean_part.strip())
+        clean_part = UNSAFE_FOLDER_CHARS.sub('', part)
+        clean_part = WHITESPACE_RUN.sub('_', clean_part.strip())
         
         # Create destination path: Piece/Instrument/Part/
         dest_dir = output_dir / clean_piece / clean_instrument / clean_part
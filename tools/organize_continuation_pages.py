@@ -3,6 +3,7 @@
 Organize the continuation pages that were identified
 """
 
+import os
 import shutil
 from pathlib import Path
 
@@ -76,47 +77,54 @@ def organize_continuation_pages():
     
     moved_count = 0
     
-    # Process Feodora continuation pages
-    for filename, info in feodora_pages.items():
-        source_file = unidentified_dir / filename
-        
-        if source_file.exists():
-            dest_dir = usb_path / info['destination']
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            dest_file = dest_dir / info['new_name']
-            source_file.rename(dest_file)
-            
-            print(f"✅ Feodora: {filename} → {info['destination']}/{info['new_name']}")
-            moved_count += 1
-        else:
-            print(f"⚠️  File not found: {filename}")
+    # One listing of the source folder tells us which pages are still to move
+    try:
+        with os.scandir(unidentified_dir) as entries:
+            present_files = {entry.name for entry in entries}
+    except FileNotFoundError:
+        present_files = set()
     
-    # Process French Comedy additional parts
-    for filename, info in french_comedy_parts.items():
-        source_file = unidentified_dir / filename
-        
-        if source_file.exists():
-            dest_dir = usb_path / info['destination']
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            dest_file = dest_dir / info['new_name']
-            source_file.rename(dest_file)
-            
-            print(f"✅ French Comedy: {filename} → {info['destination']}/{info['new_name']}")
-            moved_count += 1
-        else:
+    # Pass 1: plan a move for every page that is present
+    moves = []
+    for label, pages in (('Feodora', feodora_pages), ('French Comedy', french_comedy_parts)):
+        for filename, info in pages.items():
+            if filename not in present_files:
+                print(f"⚠️  File not found: {filename}")
+                continue
+            moves.append((label, filename, info['destination'], info['new_name']))
+    
+    # Pass 2: create each destination folder once; many pages share a folder
+    for destination in {destination for _, _, destination, _ in moves}:
+        (usb_path / destination).mkdir(parents=True, exist_ok=True)
+    
+    # Pass 3: move and rename; a source can still vanish between passes
+    for label, filename, destination, new_name in moves:
+        try:
+            os.rename(unidentified_dir / filename, usb_path / destination / new_name)
+        except FileNotFoundError:
             print(f"⚠️  File not found: {filename}")
+            continue
+        
+        print(f"✅ {label}: {filename} → {destination}/{new_name}")
+        moved_count += 1
     
-    # Check remaining files
-    remaining_files = list(unidentified_dir.glob('*.pdf'))
+    # Check remaining files (names only, skipping macOS ._ resource forks);
+    # a deleted Unidentified_Files folder simply means nothing is left
+    try:
+        with os.scandir(unidentified_dir) as entries:
+            remaining_files = [
+                entry.name for entry in entries
+                if entry.name.endswith('.pdf') and not entry.name.startswith('._')
+            ]
+    except FileNotFoundError:
+        remaining_files = []
     print(f"\n🎵 Organization complete: {moved_count} files moved")
     print(f"📁 Remaining unidentified files: {len(remaining_files)}")
     
     if remaining_files:
         print("Remaining files:")
-        for f in remaining_files:
-            print(f"  - {f.name}")
+        for name in remaining_files:
+            print(f"  - {name}")
     else:
         print("🎉 All files have been identified and organized!")
 
@@ -3,19 +3,52 @@
 Organize PDFs using extracted visual metadata
 """
 
+import os
+import sys
 import json
 import shutil
 import re
+import concurrent.futures
 from pathlib import Path
 
+# Folder-name cleanup patterns, compiled once
+UNSAFE_FOLDER_CHARS = re.compile(r'[^\w\s\-\.]')
+WHITESPACE_RUN = re.compile(r'\s+')
+
 def clean_filename_for_folder(name):
     """Clean a name to be safe for folder names"""
     # Remove special characters, keep only alphanumeric, spaces, and basic punctuation
-    clean = re.sub(r'[^\w\s\-\.]', '', str(name))
+    clean = UNSAFE_FOLDER_CHARS.sub('', str(name))
     # Replace spaces with underscores and remove multiple spaces
-    clean = re.sub(r'\s+', '_', clean.strip())
+    clean = WHITESPACE_RUN.sub('_', clean.strip())
     return clean
 
+# Per-file report lines are written to stdout in batches of this size
+REPORT_BATCH_SIZE = 25
+
+def flush_report(lines):
+    """Write buffered report lines to stdout in one call and clear the buffer"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+        lines.clear()
+
+def iter_pdf_entries(root):
+    """Yield a DirEntry for every PDF under root, one scandir call per folder"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Unreadable folders (.Trashes, .Spotlight-V100, ...) are skipped like rglob does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith('.pdf'):
+                    yield entry
+
 def organize_pdfs_with_metadata():
     """Organize original PDFs using extracted metadata"""
     
@@ -46,61 +79,114 @@ def organize_pdfs_with_metadata():
     
     print("🎵 Organizing PDFs with extracted metadata...")
     
-    # Find all PDF files recursively
-    pdf_files = list(usb_path.rglob('*.pdf'))
+    # Find all PDF files recursively, skipping macOS ._ resource forks
+    pdf_files = [
+        Path(entry.path) for entry in iter_pdf_entries(usb_path)
+        if not entry.name.startswith('._')
+    ]
     print(f"Found {len(pdf_files)} PDF files")
     
-    for pdf_file in pdf_files:
-        try:
-            # Skip system files
-            if pdf_file.name.startswith('._'):
-                continue
+    report_lines = []
+    
+    def report(line):
+        report_lines.append(line)
+        if len(report_lines) >= REPORT_BATCH_SIZE:
+            flush_report(report_lines)
+    
+    # Buffered report lines are written even if something below raises
+    try:
+        # Resolve destinations first; the copies themselves run in a thread pool
+        copy_jobs = []
+        claimed_dests = {}
+        
+        for pdf_file in pdf_files:
+            try:
+                # Get corresponding JPEG metadata
+                jpeg_name = pdf_file.stem + '.jpg'
+                file_metadata = None
                 
-            # Get corresponding JPEG metadata
-            jpeg_name = pdf_file.stem + '.jpg'
-            file_metadata = None
-            
-            # Check if we have corrected metadata for this file
-            if pdf_file.name in corrected_metadata:
-                file_metadata = corrected_metadata[pdf_file.name]
-                print(f"✅ Using corrected metadata for {pdf_file.name}")
-            elif jpeg_name in metadata:
-                file_metadata = metadata[jpeg_name]
-                # Skip files with no useful metadata
-                if file_metadata.get('piece_name') == 'Unknown':
-                    print(f"⚠️  Skipping {pdf_file.name} - no metadata available")
+                # Check if we have corrected metadata for this file
+                if pdf_file.name in corrected_metadata:
+                    file_metadata = corrected_metadata[pdf_file.name]
+                    report(f"✅ Using corrected metadata for {pdf_file.name}")
+                elif jpeg_name in metadata:
+                    file_metadata = metadata[jpeg_name]
+                    # Skip files with no useful metadata
+                    if file_metadata.get('piece_name') == 'Unknown':
+                        report(f"⚠️  Skipping {pdf_file.name} - no metadata available")
+                        continue
+                else:
+                    report(f"⚠️  No metadata found for {pdf_file.name}")
                     continue
-            else:
-                print(f"⚠️  No metadata found for {pdf_file.name}")
-                continue
-            
-            # Extract metadata
-            piece_name = file_metadata.get('piece_name', 'Unknown_Piece')
-            instrument = file_metadata.get('instrument', 'Unknown_Instrument')
-            part = file_metadata.get('part', 'Unknown_Part')
-            key_signature = file_metadata.get('key_signature', '')
-            composer = file_metadata.get('composer', 'Unknown_Composer')
-            
-            # Clean names for folder structure
-            clean_piece = clean_filename_for_folder(piece_name)
-            clean_instrument = clean_filename_for_folder(instrument)
-            clean_part = clean_filename_for_folder(part)
-            
-            # Create folder structure: Piece/Instrument/Part/
-            dest_dir = output_path / clean_piece / clean_instrument / clean_part
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Copy file
-            dest_file = dest_dir / pdf_file.name
-            shutil.copy2(pdf_file, dest_file)
-            
-            relative_path = dest_file.relative_to(output_path)
-            print(f"📁 {pdf_file.name} → {relative_path}")
-            organized_count += 1
+                
+                # Extract metadata
+                piece_name = file_metadata.get('piece_name', 'Unknown_Piece')
+                instrument = file_metadata.get('instrument', 'Unknown_Instrument')
+                part = file_metadata.get('part', 'Unknown_Part')
+                key_signature = file_metadata.get('key_signature', '')
+                composer = file_metadata.get('composer', 'Unknown_Composer')
+                
+                # Clean names for folder structure
+                clean_piece = clean_filename_for_folder(piece_name)
+                clean_instrument = clean_filename_for_folder(instrument)
+                clean_part = clean_filename_for_folder(part)
+                
+                # Folder structure: Piece/Instrument/Part/
+                dest_dir = output_path / clean_piece / clean_instrument / clean_part
+                dest_file = dest_dir / pdf_file.name
+                
+                # Two sources with the same name and metadata would be copied onto
+                # the same file concurrently; keep the first one only. Compared
+                # lowercased because the output volume is usually case-insensitive
+                dest_key = str(dest_file).lower()
+                if dest_key in claimed_dests:
+                    report(f"⚠️  Skipping {pdf_file} - {claimed_dests[dest_key]} already goes to {dest_file.relative_to(output_path)}")
+                    continue
+                claimed_dests[dest_key] = pdf_file
+                copy_jobs.append((pdf_file, dest_file))
+                
+            except Exception as e:
+                report(f"❌ Failed to organize {pdf_file.name}: {e}")
+                failed_count += 1
+        
+        # Create every destination folder up front so workers never race on mkdir;
+        # a folder that cannot be created fails only the files headed there
+        failed_dirs = set()
+        for dest_dir in {dest_file.parent for _, dest_file in copy_jobs}:
+            try:
+                dest_dir.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                report(f"❌ Failed to create {dest_dir.relative_to(output_path)}: {e}")
+                failed_dirs.add(dest_dir)
+        
+        if failed_dirs:
+            for pdf_file, dest_file in copy_jobs:
+                if dest_file.parent in failed_dirs:
+                    report(f"❌ Failed to organize {pdf_file.name}: destination folder unavailable")
+                    failed_count += 1
+            copy_jobs = [job for job in copy_jobs if job[1].parent not in failed_dirs]
+        
+        # Copies are I/O-bound, so threads overlap USB reads with SSD writes.
+        # copyfile skips copy2's stat/utime/chmod/xattr work, which is wasted on
+        # a FAT/exFAT USB source.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {
+                executor.submit(shutil.copyfile, pdf_file, dest_file): (pdf_file, dest_file)
+                for pdf_file, dest_file in copy_jobs
+            }
             
-        except Exception as e:
-            print(f"❌ Failed to organize {pdf_file.name}: {e}")
-            failed_count += 1
+            for future in concurrent.futures.as_completed(futures):
+                pdf_file, dest_file = futures[future]
+                try:
+                    future.result()
+                    relative_path = dest_file.relative_to(output_path)
+                    report(f"📁 {pdf_file.name} → {relative_path}")
+                    organized_count += 1
+                except Exception as e:
+                    report(f"❌ Failed to organize {pdf_file.name}: {e}")
+                    failed_count += 1
+    finally:
+        flush_report(report_lines)
     
     print(f"\n🎵 Organization Complete:")
     print(f"  ✅ Organized: {organized_count}")
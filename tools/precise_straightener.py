@@ -3,73 +3,126 @@
 Precise PDF Straightener - Use matrix transformations for exact angles
 Works with any angle (not just 90° increments)
 
-Usage: python3 precise_straightener.py input.pdf output.pdf angle
+Usage: python3 precise_straightener.py input.pdf output.pdf angle [--incremental]
 Example: python3 precise_straightener.py input.pdf output.pdf 2.5
+
+--incremental (implied when output == input) appends only the changed objects
+to the end of the file instead of rewriting it. The file grows slightly but the
+write is a fraction of the I/O for large scans. Files that cannot be appended
+to (e.g. ones MuPDF repairs on open) fall back to a full save.
 """
 
+import os
 import sys
 import fitz
 import math
+import shutil
+import logging
 from pathlib import Path
 
-def precise_straighten(input_path: str, output_path: str, angle: float):
+logger = logging.getLogger(__name__)
+
+def add_content_stream(doc, data: bytes) -> int:
+    """Create a new stream object holding raw content bytes, return its xref"""
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, data, new=True, compress=False)
+    return xref
+
+def wrap_page_contents(doc, page, transform_xref: int, restore_xref: int):
+    """Wrap the page's content streams in 'q <matrix> cm ... Q' by reference
+    
+    transform_xref and restore_xref are shared streams holding the opening
+    'q ... cm' and closing 'Q', so pages of the same size point at the same
+    objects instead of each getting their own copy.
+    """
+    content_xrefs = [transform_xref] + page.get_contents() + [restore_xref]
+    
+    refs = " ".join(f"{xref} 0 R" for xref in content_xrefs)
+    doc.xref_set_key(page.xref, "Contents", f"[{refs}]")
+
+def precise_straighten(input_path: str, output_path: str, angle: float, incremental: bool = False):
     """Apply precise rotation using matrix transformation"""
     try:
         print(f"📄 Precise straightening: {input_path}")
         print(f"🔄 Applying {angle}° rotation using matrix transformation...")
         
+        original_size = Path(input_path).stat().st_size
+        same_file = Path(input_path).resolve() == Path(output_path).resolve()
+        incremental = incremental or same_file
+        
         doc = fitz.open(input_path)
+        if incremental and not doc.can_save_incrementally():
+            # e.g. a file MuPDF had to repair on open
+            print(f"⚠️  Incremental save not possible for this file, doing a full save")
+            incremental = False
+        elif incremental and not same_file:
+            # Incremental saves must go to the file that was opened
+            doc.close()
+            shutil.copyfile(input_path, output_path)
+            doc = fitz.open(output_path)
+        
+        # Page edits stay on this thread (MuPDF documents are not thread-safe);
+        # the work that can be shared across pages is created once up front
+        restore_xref = add_content_stream(doc, b"\nQ")
+        
+        # Convert angle to radians
+        angle_rad = math.radians(angle)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+        
+        # Scanned scores are nearly always one page size, so the matrix and
+        # its content stream are built once per distinct page rectangle
+        transform_xrefs = {}
+        rotated_pages = 0
         
         for page_num, page in enumerate(doc):
             # Get page rectangle
             rect = page.rect
-            center_x = (rect.x0 + rect.x1) / 2
-            center_y = (rect.y0 + rect.y1) / 2
-            
-            print(f"   Page {page_num + 1}: {rect.width:.0f}x{rect.height:.0f}, center at ({center_x:.0f}, {center_y:.0f})")
+            bucket = (rect.x0, rect.y0, rect.x1, rect.y1)
             
-            # Convert angle to radians
-            angle_rad = math.radians(angle)
-            cos_a = math.cos(angle_rad)
-            sin_a = math.sin(angle_rad)
-            
-            # Create rotation matrix around center point
-            # Step 1: Translate to origin
-            matrix1 = fitz.Matrix(1, 0, 0, 1, -center_x, -center_y)
-            # Step 2: Rotate
-            matrix2 = fitz.Matrix(cos_a, sin_a, -sin_a, cos_a, 0, 0)
-            # Step 3: Translate back
-            matrix3 = fitz.Matrix(1, 0, 0, 1, center_x, center_y)
-            
-            # Combine transformations
-            final_matrix = matrix1 * matrix2 * matrix3
-            
-            print(f"   Matrix: [{final_matrix.a:.3f}, {final_matrix.b:.3f}, {final_matrix.c:.3f}, {final_matrix.d:.3f}, {final_matrix.e:.1f}, {final_matrix.f:.1f}]")
-            
-            # Get current page contents
-            try:
-                contents = page.get_contents()
+            if bucket not in transform_xrefs:
+                center_x = (rect.x0 + rect.x1) / 2
+                center_y = (rect.y0 + rect.y1) / 2
+                
+                # Rotation around center point in closed form
+                # (translate to origin * rotate * translate back)
+                e = center_x - center_x * cos_a + center_y * sin_a
+                f = center_y - center_x * sin_a - center_y * cos_a
+                final_matrix = fitz.Matrix(cos_a, sin_a, -sin_a, cos_a, e, f)
                 
-                # Create new content stream with transformation
-                new_contents = f"q {final_matrix.a} {final_matrix.b} {final_matrix.c} {final_matrix.d} {final_matrix.e} {final_matrix.f} cm\n".encode()
-                new_contents += contents
-                new_contents += b"\nQ"
+                logger.debug("Page size %.0fx%.0f, center at (%.0f, %.0f), matrix: %s",
+                             rect.width, rect.height, center_x, center_y, final_matrix)
                 
-                # Apply new contents
-                page.set_contents(new_contents)
-                print(f"   ✅ Applied matrix transformation successfully")
+                prefix = f"q {final_matrix.a} {final_matrix.b} {final_matrix.c} {final_matrix.d} {final_matrix.e} {final_matrix.f} cm\n"
+                transform_xrefs[bucket] = add_content_stream(doc, prefix.encode())
+            
+            # Wrap existing content streams without reading them into Python
+            try:
+                wrap_page_contents(doc, page, transform_xrefs[bucket], restore_xref)
+                rotated_pages += 1
                 
             except Exception as content_error:
-                print(f"   ❌ Matrix transformation failed: {content_error}")
+                print(f"   ❌ Page {page_num + 1}: matrix transformation failed: {content_error}")
                 print(f"   ⚠️  This PDF may not support content stream modification")
         
-        # Save with zero compression to preserve quality
-        print(f"💾 Saving with zero compression...")
-        doc.save(output_path, garbage=0, deflate=False, clean=False)
+        print(f"   ✅ Rotated {rotated_pages}/{len(doc)} pages by {angle:.2f}°")
+        
+        if incremental:
+            # Append only the modified objects; existing bytes are untouched
+            print(f"💾 Saving incrementally...")
+            doc.save(output_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+        else:
+            # Save with zero compression to preserve quality
+            print(f"💾 Saving with zero compression...")
+            # A full save cannot overwrite the open file; swap it in after closing
+            save_path = f"{output_path}.tmp" if same_file else output_path
+            doc.save(save_path, garbage=0, deflate=False, clean=False)
         doc.close()
+        if not incremental and same_file:
+            os.replace(save_path, output_path)
         
         # Check result
-        original_size = Path(input_path).stat().st_size
         new_size = Path(output_path).stat().st_size
         size_change = ((new_size - original_size) / original_size) * 100
         print(f"✅ Precise straightening complete!")
@@ -82,13 +135,19 @@ def precise_straighten(input_path: str, output_path: str, angle: float):
         return False
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python3 precise_straightener.py input.pdf output.pdf angle")
+    # Per-page geometry is logged at DEBUG; set LOG_LEVEL=DEBUG to see it
+    logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='   %(message)s')
+    
+    args = [arg for arg in sys.argv[1:] if arg != '--incremental']
+    use_incremental = len(args) != len(sys.argv) - 1
+    
+    if len(args) != 3:
+        print("Usage: python3 precise_straightener.py input.pdf output.pdf angle [--incremental]")
         print("Example: python3 precise_straightener.py input.pdf output.pdf 2.5")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2]
-    rotation_angle = float(sys.argv[3])
+    input_file = args[0]
+    output_file = args[1]
+    rotation_angle = float(args[2])
     
-    precise_straighten(input_file, output_file, rotation_angle)
\ No newline at end of file
+    precise_straighten(input_file, output_file, rotation_angle, use_incremental)
\ No newline at end of file
@@ -3,9 +3,26 @@
 Reorganize the German Feodora Ouverture files that were misidentified
 """
 
+import os
 import shutil
 from pathlib import Path
 
+# German file mappings based on visual analysis:
+# (filename, instrument, part, key, new_name)
+GERMAN_FILES = (
+    ('SKM_C257i25061716381.pdf', 'Clarinet', '1st', 'Bb', 'Feodora_Ouverture_Clarinet_1st_Bb.pdf'),
+    ('SKM_C257i25061716390.pdf', 'Oboe', 'Unknown', 'C', 'Feodora_Ouverture_Oboe.pdf'),
+    ('SKM_C257i25061716400.pdf', 'Trumpet', '1st_2nd_3rd', 'Bb', 'Feodora_Ouverture_Trumpet_1st_2nd_3rd_Bb.pdf'),
+    ('SKM_C257i25061716410.pdf', 'Trombone', '1st_2nd', 'C', 'Feodora_Ouverture_Trombone_1st_2nd.pdf'),
+    ('SKM_C257i25061716430.pdf', 'Clarinet', 'Eb', 'Eb', 'Feodora_Ouverture_Clarinet_Eb.pdf'),
+    ('SKM_C257i25061716450.pdf', 'Alto_Saxophone', 'Unknown', 'Eb', 'Feodora_Ouverture_Alto_Saxophone_Eb.pdf'),
+    ('SKM_C257i25061716460.pdf', 'Tenor_Horn', '2nd_3rd', 'Bb', 'Feodora_Ouverture_Tenor_Horn_2nd_3rd_Bb.pdf'),
+    ('SKM_C257i25061716470.pdf', 'Horn', '1st_2nd', 'Eb', 'Feodora_Ouverture_Horn_1st_2nd_Eb.pdf'),
+    ('SKM_C257i25061716480.pdf', 'Flugelhorn', '1st', 'Bb', 'Feodora_Ouverture_Flugelhorn_1st_Bb.pdf'),
+    ('SKM_C257i25061716550.pdf', 'Score', 'Conductor', 'C', 'Feodora_Ouverture_Conductor_Score.pdf'),
+    ('SKM_C257i25061716580.pdf', 'Baritone', 'Unknown', 'Bb', 'Feodora_Ouverture_Baritone_Bb.pdf'),
+)
+
 def reorganize_german_files():
     """Move German Feodora files to proper organization"""
     
@@ -13,103 +30,43 @@ def reorganize_german_files():
     unidentified_dir = usb_path / 'Unidentified_Files'
     feodora_dir = usb_path / 'Feodora_Ouverture'
     
-    # German file mappings based on visual analysis
-    german_files = {
-        'SKM_C257i25061716381.pdf': {
-            'instrument': 'Clarinet', 
-            'part': '1st',
-            'key': 'Bb',
-            'new_name': 'Feodora_Ouverture_Clarinet_1st_Bb.pdf'
-        },
-        'SKM_C257i25061716390.pdf': {
-            'instrument': 'Oboe',
-            'part': 'Unknown',
-            'key': 'C',
-            'new_name': 'Feodora_Ouverture_Oboe.pdf'
-        },
-        'SKM_C257i25061716400.pdf': {
-            'instrument': 'Trumpet',
-            'part': '1st_2nd_3rd',
-            'key': 'Bb',
-            'new_name': 'Feodora_Ouverture_Trumpet_1st_2nd_3rd_Bb.pdf'
-        },
-        'SKM_C257i25061716410.pdf': {
-            'instrument': 'Trombone',
-            'part': '1st_2nd',
-            'key': 'C',
-            'new_name': 'Feodora_Ouverture_Trombone_1st_2nd.pdf'
-        },
-        'SKM_C257i25061716430.pdf': {
-            'instrument': 'Clarinet',
-            'part': 'Eb',
-            'key': 'Eb',
-            'new_name': 'Feodora_Ouverture_Clarinet_Eb.pdf'
-        },
-        'SKM_C257i25061716450.pdf': {
-            'instrument': 'Alto_Saxophone',
-            'part': 'Unknown',
-            'key': 'Eb',
-            'new_name': 'Feodora_Ouverture_Alto_Saxophone_Eb.pdf'
-        },
-        'SKM_C257i25061716460.pdf': {
-            'instrument': 'Tenor_Horn',
-            'part': '2nd_3rd',
-            'key': 'Bb',
-            'new_name': 'Feodora_Ouverture_Tenor_Horn_2nd_3rd_Bb.pdf'
-        },
-        'SKM_C257i25061716470.pdf': {
-            'instrument': 'Horn',
-            'part': '1st_2nd',
-            'key': 'Eb',
-            'new_name': 'Feodora_Ouverture_Horn_1st_2nd_Eb.pdf'
-        },
-        'SKM_C257i25061716480.pdf': {
-            'instrument': 'Flugelhorn',
-            'part': '1st',
-            'key': 'Bb',
-            'new_name': 'Feodora_Ouverture_Flugelhorn_1st_Bb.pdf'
-        },
-        'SKM_C257i25061716550.pdf': {
-            'instrument': 'Score',
-            'part': 'Conductor',
-            'key': 'C',
-            'new_name': 'Feodora_Ouverture_Conductor_Score.pdf'
-        },
-        'SKM_C257i25061716580.pdf': {
-            'instrument': 'Baritone',
-            'part': 'Unknown',
-            'key': 'Bb',
-            'new_name': 'Feodora_Ouverture_Baritone_Bb.pdf'
-        }
-    }
-    
     print("🎵 Reorganizing German Feodora Ouverture files...")
     
     reorganized_count = 0
     
-    for filename, metadata in german_files.items():
-        source_file = unidentified_dir / filename
-        
-        if source_file.exists():
-            # Create destination directory
-            instrument = metadata['instrument']
-            part = metadata['part']
-            
-            if part in ['Unknown', 'Conductor']:
-                dest_dir = feodora_dir / instrument
-            else:
-                dest_dir = feodora_dir / instrument / part
-            
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Move and rename file
-            dest_file = dest_dir / metadata['new_name']
-            source_file.rename(dest_file)
-            
-            print(f"✅ Moved: {filename} → {dest_file.relative_to(usb_path)}")
-            reorganized_count += 1
+    # One listing of the source folder tells us which files are still to move
+    try:
+        with os.scandir(unidentified_dir) as entries:
+            present_files = {entry.name for entry in entries}
+    except FileNotFoundError:
+        present_files = set()
+    
+    # Pass 1: plan a move for every file that is present
+    moves = []
+    for filename, instrument, part, key, new_name in GERMAN_FILES:
+        if filename not in present_files:
+            print(f"⚠️  File not found: {filename}")
+            continue
+        if part in ('Unknown', 'Conductor'):
+            dest_dir = feodora_dir / instrument
         else:
+            dest_dir = feodora_dir / instrument / part
+        moves.append((filename, unidentified_dir / filename, dest_dir / new_name))
+    
+    # Pass 2: create each destination directory once
+    for dest_dir in {dest_file.parent for _, _, dest_file in moves}:
+        os.makedirs(dest_dir, exist_ok=True)
+    
+    # Pass 3: move and rename; a source can still vanish between passes
+    for filename, source_file, dest_file in moves:
+        try:
+            os.rename(source_file, dest_file)
+        except FileNotFoundError:
             print(f"⚠️  File not found: {filename}")
+            continue
+        
+        print(f"✅ Moved: {filename} → {dest_file.relative_to(usb_path)}")
+        reorganized_count += 1
     
     print(f"\n🎵 Reorganization complete: {reorganized_count} German files moved")
     